@@ -16,9 +16,20 @@ Usage:
 """
 
 import asyncio
+import json
+import signal
+import struct
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
 from bleak import BleakScanner, BleakClient
 import sys
 
+# Prebuilt unpacker for the u16 little-endian joystick axes - avoids
+# int.from_bytes keyword parsing on every notification
+_U16 = struct.Struct('<H')
+
 # BLE UUIDs for the joystick service
 SERVICE_UUID = "12345678-1234-5678-1234-56789abcdef0"
 X_CHAR_UUID = "12345678-1234-5678-1234-56789abcdef1"
@@ -29,69 +40,134 @@ BTN_B_UUID = "12345678-1234-5678-1234-56789abcdef4"
 # Device name to search for
 DEVICE_NAME = "microbit-joy"
 
-# Global state for display
-joystick_x = 512
-joystick_y = 512
-button_a_state = "released"
-button_b_state = "released"
+# Last-seen device address is cached here so later runs can try a
+# direct reconnect before falling back to a full scan
+ADDRESS_CACHE = Path.home() / ".cache" / "microbit-joy.json"
+
+# How often the joystick status line is refreshed (seconds).
+# Notifications can arrive much faster than a terminal can usefully
+# display, so the handlers only record the latest values and the
+# display loop prints them at a bounded rate (latest value wins).
+DISPLAY_INTERVAL = 0.05  # 20 Hz
+
+
+@dataclass(slots=True)
+class JoystickState:
+    """Latest values received from the micro:bit"""
+    x: int = 512
+    y: int = 512
+    buttons: dict = field(default_factory=lambda: {"A": "released", "B": "released"})
+
+
+# Shared by the notification handlers and the display loop
+state = JoystickState()
+
+
+async def refresh_display():
+    """Print the latest joystick/button state at a bounded rate"""
+    last_line = None
+    while True:
+        line = (f"📍 Joystick X: {state.x:4d}  Y: {state.y:4d}"
+                f"  |  Button A: {state.buttons['A']:8s}  Button B: {state.buttons['B']:8s}")
+        if line != last_line:
+            # Single preformatted write - print() would issue separate
+            # text and newline writes to the terminal
+            sys.stdout.write(line + "\n")
+            last_line = line
+        await asyncio.sleep(DISPLAY_INTERVAL)
+
+
+def _handle_x(data):
+    """X-axis is u16 (little-endian) - displayed by refresh_display()"""
+    state.x = _U16.unpack_from(data)[0]
+
+
+def _handle_y(data):
+    """Y-axis is u16 (little-endian) - displayed by refresh_display()"""
+    state.y = _U16.unpack_from(data)[0]
+
+
+def _handle_button(name, data):
+    """Buttons are u8 (0 = released, 1 = pressed)"""
+    pressed = data[0] == 1
+    state.buttons[name] = "PRESSED" if pressed else "released"
+    if pressed:
+        print(f"🔘 Button {name}: PRESSED")
+    else:
+        print(f"   Button {name}: released")
+
+
+# bleak reports characteristic UUIDs in lowercase and the constants
+# above are already lowercase, so dispatch is a single dict lookup
+NOTIFY_HANDLERS = {
+    X_CHAR_UUID: _handle_x,
+    Y_CHAR_UUID: _handle_y,
+    BTN_A_UUID: partial(_handle_button, "A"),
+    BTN_B_UUID: partial(_handle_button, "B"),
+}
+
+
+# Every characteristic we subscribe to
+NOTIFY_UUIDS = tuple(NOTIFY_HANDLERS)
 
 
 def notification_handler(sender, data):
-    """Handle notifications from all characteristics"""
-    global joystick_x, joystick_y, button_a_state, button_b_state
-
-    uuid = sender.uuid.lower()
-
-    if uuid == X_CHAR_UUID.lower():
-        # X-axis is u16 (little-endian)
-        joystick_x = int.from_bytes(data, byteorder='little', signed=False)
-        print(f"📍 Joystick X: {joystick_x:4d}", end="")
-        print(f"  Y: {joystick_y:4d}  |  Button A: {button_a_state:8s}  Button B: {button_b_state:8s}")
-
-    elif uuid == Y_CHAR_UUID.lower():
-        # Y-axis is u16 (little-endian)
-        joystick_y = int.from_bytes(data, byteorder='little', signed=False)
-
-    elif uuid == BTN_A_UUID.lower():
-        # Button A is u8 (0 = released, 1 = pressed)
-        pressed = data[0] == 1
-        button_a_state = "PRESSED" if pressed else "released"
-        if pressed:
-            print(f"🔘 Button A: PRESSED")
-        else:
-            print(f"   Button A: released")
-
-    elif uuid == BTN_B_UUID.lower():
-        # Button B is u8 (0 = released, 1 = pressed)
-        pressed = data[0] == 1
-        button_b_state = "PRESSED" if pressed else "released"
-        if pressed:
-            print(f"🔘 Button B: PRESSED")
-        else:
-            print(f"   Button B: released")
-
-
-async def read_initial_values(client):
+    """Dispatch a notification to the handler for its characteristic"""
+    handler = NOTIFY_HANDLERS.get(sender.uuid)
+    if handler is not None:
+        handler(data)
+
+
+def load_cached_address():
+    """Return the device address from the last successful run, or None"""
+    try:
+        return json.loads(ADDRESS_CACHE.read_text()).get("address")
+    except (OSError, ValueError):
+        return None
+
+
+def save_cached_address(address):
+    """Remember the device address for the next run"""
+    try:
+        ADDRESS_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        ADDRESS_CACHE.write_text(json.dumps({"address": address}))
+    except OSError:
+        pass
+
+
+async def find_device():
+    """Scan for the micro:bit, filtering by service UUID at the OS level"""
+    # The service-UUID filter drops unrelated advertisements before they
+    # reach Python, so the scan ends on the first matching packet
+    # instead of name-matching everything in range
+    async with BleakScanner(service_uuids=[SERVICE_UUID]) as scanner:
+        async for device, _adv in scanner.advertisement_data():
+            if device.name == DEVICE_NAME:
+                return device
+
+
+async def read_initial_values(client, chars):
     """Read initial values from all characteristics"""
     print("\n📖 Reading initial values...")
 
-    # Read X-axis
-    x_data = await client.read_gatt_char(X_CHAR_UUID)
-    x_value = int.from_bytes(x_data, byteorder='little', signed=False)
+    # Each read is a full BLE round-trip, so issue all four
+    # concurrently - total time is ~1 connection interval instead of 4
+    x_data, y_data, btn_a_data, btn_b_data = await asyncio.gather(
+        client.read_gatt_char(chars[X_CHAR_UUID]),
+        client.read_gatt_char(chars[Y_CHAR_UUID]),
+        client.read_gatt_char(chars[BTN_A_UUID]),
+        client.read_gatt_char(chars[BTN_B_UUID]),
+    )
+
+    x_value = _U16.unpack_from(x_data)[0]
     print(f"   X-axis: {x_value}")
 
-    # Read Y-axis
-    y_data = await client.read_gatt_char(Y_CHAR_UUID)
-    y_value = int.from_bytes(y_data, byteorder='little', signed=False)
+    y_value = _U16.unpack_from(y_data)[0]
     print(f"   Y-axis: {y_value}")
 
-    # Read Button A
-    btn_a_data = await client.read_gatt_char(BTN_A_UUID)
     btn_a = "PRESSED" if btn_a_data[0] == 1 else "released"
     print(f"   Button A: {btn_a}")
 
-    # Read Button B
-    btn_b_data = await client.read_gatt_char(BTN_B_UUID)
     btn_b = "PRESSED" if btn_b_data[0] == 1 else "released"
     print(f"   Button B: {btn_b}")
 
@@ -104,7 +180,15 @@ async def main():
 
     # Scan for device
     try:
-        device = await BleakScanner.find_device_by_name(DEVICE_NAME, timeout=10.0)
+        # Fast path: reconnect by the cached address, skipping the scan
+        device = None
+        address = load_cached_address()
+        if address:
+            device = await BleakScanner.find_device_by_address(address, timeout=3.0)
+        if device is None:
+            device = await asyncio.wait_for(find_device(), timeout=10.0)
+    except asyncio.TimeoutError:
+        device = None
     except Exception as e:
         print(f"❌ Scan error: {e}")
         return
@@ -119,6 +203,7 @@ async def main():
         return
 
     print(f"✅ Found device: {device.name} ({device.address})")
+    save_cached_address(device.address)
     print(f"\n🔗 Connecting...")
 
     # Connect to device
@@ -126,42 +211,67 @@ async def main():
         async with BleakClient(device) as client:
             print(f"✅ Connected!")
 
-            # Check if service exists
-            services = await client.get_services()
-            service = services.get_service(SERVICE_UUID)
+            # The backend negotiates the ATT MTU automatically; log it
+            # so per-notification packet overhead is visible
+            try:
+                print(f"   ATT MTU: {client.mtu_size} bytes")
+            except Exception:
+                pass
+
+            # Check if service exists - client.services is already
+            # populated during connect, no extra round-trip
+            service = client.services.get_service(SERVICE_UUID)
             if service is None:
                 print(f"❌ Service {SERVICE_UUID} not found!")
                 return
 
             print(f"✅ Found joystick service")
 
-            # Read initial values
-            await read_initial_values(client)
-
-            # Subscribe to notifications
-            print(f"\n📡 Starting notifications...")
-            await client.start_notify(X_CHAR_UUID, notification_handler)
-            await client.start_notify(Y_CHAR_UUID, notification_handler)
-            await client.start_notify(BTN_A_UUID, notification_handler)
-            await client.start_notify(BTN_B_UUID, notification_handler)
+            # Resolve each characteristic object once - passing the
+            # object to read/notify calls skips bleak's per-call UUID
+            # lookup
+            chars = {uuid: service.get_characteristic(uuid)
+                     for uuid in NOTIFY_UUIDS}
 
-            print("✅ Monitoring joystick and buttons...")
-            print("\nMove the joystick and press buttons A/B on the micro:bit")
-            print("Press Ctrl+C to stop\n")
-            print("-" * 60)
-
-            # Keep connection alive and monitor for 60 seconds (or until Ctrl+C)
-            try:
-                await asyncio.sleep(3600)  # Monitor for 1 hour
-            except KeyboardInterrupt:
+            # Read initial values
+            await read_initial_values(client, chars)
+
+            async with AsyncExitStack() as stack:
+                # Subscribe to notifications. Each subscription is a
+                # CCCD write round-trip, so start them all concurrently;
+                # the exit stack guarantees every subscription is torn
+                # down even if we unwind early on an error
+                print(f"\n📡 Starting notifications...")
+                await asyncio.gather(
+                    *(client.start_notify(char, notification_handler)
+                      for char in chars.values())
+                )
+                for char in chars.values():
+                    stack.push_async_callback(client.stop_notify, char)
+
+                print("✅ Monitoring joystick and buttons...")
+                print("\nMove the joystick and press buttons A/B on the micro:bit")
+                print("Press Ctrl+C to stop\n")
+                print("-" * 60)
+
+                # Show the latest joystick state at a bounded rate
+                display_task = asyncio.create_task(refresh_display())
+                stack.callback(display_task.cancel)
+
+                # Idle until Ctrl+C - waiting on an event costs nothing
+                # while blocked and shuts down cleanly instead of a
+                # KeyboardInterrupt unwinding through the connection
+                stop = asyncio.Event()
+                loop = asyncio.get_running_loop()
+                try:
+                    loop.add_signal_handler(signal.SIGINT, stop.set)
+                    loop.add_signal_handler(signal.SIGTERM, stop.set)
+                except NotImplementedError:
+                    # e.g. Windows - fall back to KeyboardInterrupt
+                    pass
+                await stop.wait()
                 print("\n\n⏹️  Stopping...")
-
-            # Unsubscribe
-            print("📡 Stopping notifications...")
-            await client.stop_notify(X_CHAR_UUID)
-            await client.stop_notify(Y_CHAR_UUID)
-            await client.stop_notify(BTN_A_UUID)
-            await client.stop_notify(BTN_B_UUID)
+                print("📡 Stopping notifications...")
 
             print("✅ Disconnected")
 
@@ -172,6 +282,14 @@ async def main():
 
 
 if __name__ == "__main__":
+    # uvloop dispatches bleak's notification callbacks in C instead of
+    # the pure-Python selector loop; purely optional
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     try:
         asyncio.run(main())
     except KeyboardInterrupt: